@@ -1,15 +1,26 @@
 import json
+import math
 import os
 import sys
 import threading
 import time
 import uuid
 import queue
+import collections
+from concurrent.futures import CancelledError, Future, as_completed, TimeoutError as FuturesTimeoutError
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-from urllib import request
+from tkinter import ttk, messagebox
+from urllib import parse, request
+import urllib3
+from urllib3.util import Retry
 import winsound
-import datetime
+from functools import lru_cache
+from dataclasses import dataclass, fields
+
+try:
+    import orjson  # optional, faster JSON
+except ImportError:
+    orjson = None
 
 APP_TITLE = "Crypto Price Alert (Final)"
 DB_FILENAME = "crypto_alerts.json"
@@ -17,16 +28,41 @@ DB_FILENAME = "crypto_alerts.json"
 DEFAULT_SETTINGS = {
     "check_interval_seconds": 60,
     "auto_silence_seconds": 60,
-    "assume_quote": "USDT"
+    "assume_quote": "USDT",
+    "price_cache_seconds": 10
 }
 
+@dataclass
+class Settings:
+    """Typed view of db["settings"], parsed once; see from_dict / to_dict."""
+    check_interval_seconds: int = 60
+    auto_silence_seconds: int = 60
+    assume_quote: str = "USDT"
+    price_cache_seconds: float = 10
+
+    @classmethod
+    def from_dict(cls, data):
+        obj = cls()
+        for f in fields(cls):
+            try:
+                setattr(obj, f.name, f.type(data.get(f.name, getattr(obj, f.name))))
+            except (TypeError, ValueError):
+                pass  # keep the default for a malformed value
+        return obj
+
+    def to_dict(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
 # --------------------------- Utilities & DB ---------------------------
 
+_APP_DIR = os.path.dirname(os.path.abspath(sys.argv[0]))
+_DB_PATH = os.path.join(_APP_DIR, DB_FILENAME)
+
 def app_dir():
-    return os.path.dirname(os.path.abspath(sys.argv[0]))
+    return _APP_DIR
 
 def db_path():
-    return os.path.join(app_dir(), DB_FILENAME)
+    return _DB_PATH
 
 def load_db():
     if not os.path.exists(db_path()):
@@ -34,8 +70,8 @@ def load_db():
         save_db(data)
         return data
     try:
-        with open(db_path(), "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(db_path(), "rb") as f:
+            data = json_loads(f.read())
     except Exception:
         data = {"settings": DEFAULT_SETTINGS.copy(), "coins": []}
     # defaults
@@ -49,22 +85,85 @@ def load_db():
             c["enabled"] = True
     return data
 
-def save_db(data):
+def json_loads(raw: bytes):
+    """Parse UTF-8 JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)  # json accepts UTF-8 bytes directly
+
+def dump_db(data):
+    """Serialize the database to compact UTF-8 JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def save_db(data, text=None):
+    """Write the database atomically (temp file + rename). Returns True on success."""
+    if text is None:
+        text = dump_db(data)
+    tmp = db_path() + ".tmp"
     try:
-        with open(db_path(), "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(tmp, "wb") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())  # data on disk before the rename makes it visible
+        os.replace(tmp, db_path())
+        return True
     except Exception as e:
         messagebox.showerror("Save Error", f"Could not save database:\n{e}")
+        return False
+
+# log_message only queues the line; a daemon thread, woken by the first queued line,
+# appends the queue to log.txt LOG_FLUSH_SECONDS later (and flush_log() runs once more
+# on exit). Nothing wakes while nothing is logged.
+LOG_FLUSH_SECONDS = 2
+_LOG_Q = collections.deque(maxlen=10000)
+_LOG_FH = None
+_LOG_LOCK = threading.Lock()
+_LOG_PENDING = threading.Event()
+_LOG_FLUSHER = None
+_LOG_TS = (None, "")  # (epoch second, formatted timestamp), reused within the same second
 
 def log_message(msg: str):
-    try:
-        log_path = os.path.join(app_dir(), "log.txt")
-        ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(f"[{ts}] {msg}\n")
-    except Exception:
-        pass
+    global _LOG_TS, _LOG_FLUSHER
+    now = int(time.time())
+    if _LOG_TS[0] != now:
+        _LOG_TS = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+    _LOG_Q.append(f"[{_LOG_TS[1]}] {msg}\n")
+    _LOG_PENDING.set()
+    if _LOG_FLUSHER is None:
+        with _LOG_LOCK:
+            if _LOG_FLUSHER is None:
+                _LOG_FLUSHER = threading.Thread(target=_log_flush_loop, daemon=True)
+                _LOG_FLUSHER.start()
+
+def flush_log():
+    global _LOG_FH
+    with _LOG_LOCK:  # pop and write together, so concurrent flushes keep the line order
+        lines = []
+        while _LOG_Q:
+            try:
+                lines.append(_LOG_Q.popleft())
+            except IndexError:
+                break
+        if not lines:
+            return
+        try:
+            if _LOG_FH is None:
+                _LOG_FH = open(os.path.join(app_dir(), "log.txt"), "a", encoding="utf-8")
+            _LOG_FH.write("".join(lines))
+            _LOG_FH.flush()
+        except Exception:
+            pass
 
+def _log_flush_loop():
+    while True:
+        _LOG_PENDING.wait()
+        time.sleep(LOG_FLUSH_SECONDS)  # batch the lines logged meanwhile into one write
+        _LOG_PENDING.clear()
+        flush_log()
+
+@lru_cache(maxsize=1024)
 def normalize_symbol(sym: str, assume_quote: str):
     s = (sym or "").strip().upper().replace("/", "").replace("-", "")
     if not s:
@@ -75,141 +174,428 @@ def normalize_symbol(sym: str, assume_quote: str):
 
 # --------------------------- Price Sources (multi-exchange) ---------------------------
 
-def _http_json(url, timeout=10):
-    req = request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    with request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+class HTTPStatusError(RuntimeError):
+    def __init__(self, status, reason=""):
+        super().__init__(f"HTTP {status} {reason}".strip())
+        self.status = status
+
+# Keep-alive connections, reused across price checks (urllib3 keeps one pool per host).
+_HTTP_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Transient failures (refused/reset connections, 429 and 5xx) are retried with backoff;
+# redirects are followed like urlopen did.
+HTTP_CONNECT_TIMEOUT = 3
+HTTP_RETRIES = 2
+HTTP_BACKOFF_SECONDS = 0.3
+_HTTP_RETRY = Retry(
+    total=None,
+    connect=HTTP_RETRIES,
+    read=1,  # one retry covers a keep-alive socket the server dropped mid-request
+    status=HTTP_RETRIES,
+    redirect=5,
+    backoff_factor=HTTP_BACKOFF_SECONDS,
+    status_forcelist=(429, 500, 502, 503, 504),
+    raise_on_status=False,
+)
+
+def _make_proxy_manager(proxy):
+    """ProxyManager for the system https proxy (https_proxy / Windows Internet Settings)."""
+    if "://" not in proxy:
+        proxy = "http://" + proxy
+    auth = urllib3.util.parse_url(proxy).auth
+    proxy_headers = urllib3.make_headers(proxy_basic_auth=parse.unquote(auth)) if auth else None
+    return urllib3.ProxyManager(proxy, num_pools=8, maxsize=4, headers=_HTTP_HEADERS,
+                                retries=_HTTP_RETRY, proxy_headers=proxy_headers)
+
+_HTTP_DIRECT = urllib3.PoolManager(num_pools=8, maxsize=4, headers=_HTTP_HEADERS, retries=_HTTP_RETRY)
+_HTTPS_PROXY = request.getproxies().get("https")
+_HTTP_PROXIED = _make_proxy_manager(_HTTPS_PROXY) if _HTTPS_PROXY else None
+
+@lru_cache(maxsize=64)
+def _pool_for(host):
+    if _HTTP_PROXIED is None or request.proxy_bypass(host):
+        return _HTTP_DIRECT
+    return _HTTP_PROXIED
+
+def close_http_pool():
+    _HTTP_DIRECT.clear()
+    if _HTTP_PROXIED is not None:
+        _HTTP_PROXIED.clear()
 
+def _http_json(url, timeout=10):
+    pool = _pool_for(parse.urlsplit(url).hostname)
+    resp = pool.request("GET", url, timeout=urllib3.Timeout(connect=min(HTTP_CONNECT_TIMEOUT, timeout), read=timeout))
+    if resp.status >= 400:
+        raise HTTPStatusError(resp.status, resp.reason or "")
+    return json_loads(resp.data)
+
+# Per-exchange circuit breaker: after CIRCUIT_MAX_FAILS consecutive network/server
+# failures the exchange is skipped for CIRCUIT_COOLOFF_SECONDS, then probed again.
+CIRCUIT_MAX_FAILS = 3
+CIRCUIT_COOLOFF_SECONDS = 60
+_EX_STATE = {}
+_EX_LOCK = threading.Lock()
+
+def _is_outage(exc):
+    # "symbol not listed" style errors (4xx, empty lists) say nothing about the exchange
+    if isinstance(exc, HTTPStatusError):
+        return exc.status == 429 or exc.status >= 500
+    return isinstance(exc, (OSError, urllib3.exceptions.HTTPError))
+
+def _call_exchange(name, fetch, *args):
+    with _EX_LOCK:
+        state = _EX_STATE.setdefault(name, {"fails": 0, "skip_until": 0.0})
+        if time.monotonic() < state["skip_until"]:
+            raise RuntimeError("circuit open")
+    try:
+        result = fetch(*args)
+    except Exception as e:
+        if _is_outage(e):
+            with _EX_LOCK:
+                state["fails"] += 1
+                if state["fails"] >= CIRCUIT_MAX_FAILS:
+                    state["skip_until"] = time.monotonic() + CIRCUIT_COOLOFF_SECONDS
+        raise
+    with _EX_LOCK:
+        state["fails"] = 0
+    return result
+
+@lru_cache(maxsize=1024)
 def _sym_binance(sym):  # BTC -> BTCUSDT
     s = sym.upper().replace("/", "").replace("-", "")
     if s.endswith("USDT"): return s
     if len(s) <= 5: return s + "USDT"
     return s
 
+@lru_cache(maxsize=1024)
 def _sym_bybit(sym):    # BTC -> BTCUSDT
     return _sym_binance(sym)
 
+@lru_cache(maxsize=1024)
 def _sym_bitunix(sym):  # BTC -> BTCUSDT
     return _sym_binance(sym)
 
+@lru_cache(maxsize=1024)
 def _sym_coinbase(sym): # BTC -> BTC-USD
     s = sym.upper().replace("/", "").replace("-", "")
     base = s[:-4] if s.endswith("USDT") else s
     return f"{base}-USD"
 
+@lru_cache(maxsize=1024)
 def _sym_upbit(sym):    # BTC -> USDT-BTC
     s = sym.upper().replace("/", "").replace("-", "")
     base = s[:-4] if s.endswith("USDT") else s
     return f"USDT-{base}"
 
+@lru_cache(maxsize=1024)
 def _sym_okx(sym):      # BTC -> BTC-USDT
     s = sym.upper().replace("/", "").replace("-", "")
     base = s[:-4] if s.endswith("USDT") else s
     return f"{base}-USDT"
 
-def fetch_price_multi(sym: str) -> float:
+def _fetch_binance(sym):
+    data = _http_json(f"https://data-api.binance.vision/api/v3/ticker/price?symbol={_sym_binance(sym)}")
+    return float(data["price"])
+
+def _fetch_bitunix(sym):  # futures markPrice as fallback
+    data = _http_json(f"https://fapi.bitunix.com/api/v1/futures/market/tickers?symbols={_sym_bitunix(sym)}")
+    items = data.get("data") or []
+    if items:
+        return float(items[0]["markPrice"])
+    raise RuntimeError("empty list")
+
+def _fetch_bybit(sym):
+    data = _http_json(f"https://api.bybit.com/v5/market/tickers?category=spot&symbol={_sym_bybit(sym)}")
+    items = data.get("result", {}).get("list", [])
+    if items:
+        return float(items[0]["lastPrice"])
+    raise RuntimeError("empty list")
+
+def _fetch_coinbase(sym):
+    data = _http_json(f"https://api.exchange.coinbase.com/products/{_sym_coinbase(sym)}/ticker")
+    return float(data["price"])
+
+def _fetch_upbit(sym):
+    arr = _http_json(f"https://api.upbit.com/v1/ticker?markets={_sym_upbit(sym)}")
+    if isinstance(arr, list) and arr:
+        return float(arr[0]["trade_price"])
+    raise RuntimeError("empty list")
+
+def _fetch_okx(sym):
+    data = _http_json(f"https://www.okx.com/api/v5/market/ticker?instId={_sym_okx(sym)}")
+    arr = data.get("data", [])
+    if arr:
+        return float(arr[0]["last"])
+    raise RuntimeError("empty data")
+
+PRICE_SOURCES = (
+    ("Binance", _fetch_binance),
+    ("Bitunix", _fetch_bitunix),
+    ("Bybit", _fetch_bybit),
+    ("Coinbase", _fetch_coinbase),
+    ("Upbit", _fetch_upbit),
+    ("OKX", _fetch_okx),
+)
+
+class DaemonThreadPool:
     """
-    Try Binance → Bitunix → Bybit → Coinbase → Upbit → OKX (no API keys).
-    Returns last price as float. Raises RuntimeError if all fail.
+    Small ThreadPoolExecutor stand-in whose workers are daemon threads, so a request still
+    blocked on the network cannot keep the process alive after the window is closed.
+    shutdown(cancel_futures=True) also wakes as_completed/wait on the cancelled futures.
     """
+    def __init__(self, max_workers, thread_name_prefix):
+        self._max_workers = max_workers
+        self._prefix = thread_name_prefix
+        self._work = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            fut = Future()
+            self._work.put((fut, fn, args))
+            if not self._idle.acquire(blocking=False) and len(self._threads) < self._max_workers:
+                t = threading.Thread(target=self._run, name=f"{self._prefix}_{len(self._threads)}", daemon=True)
+                self._threads.append(t)
+                t.start()
+        return fut
+
+    def _run(self):
+        while True:
+            item = self._work.get()
+            if item is None:
+                return
+            fut, fn, args = item
+            if fut.set_running_or_notify_cancel():
+                try:
+                    fut.set_result(fn(*args))
+                except BaseException as e:
+                    fut.set_exception(e)
+            del item, fut
+            self._idle.release()
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._work.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not None:
+                        item[0].cancel()
+                        item[0].set_running_or_notify_cancel()  # wakes the waiters
+            for _ in self._threads:
+                self._work.put(None)
+        if wait:
+            for t in self._threads:
+                t.join()
+
+_FETCH_POOL = DaemonThreadPool(max_workers=12, thread_name_prefix="price-fetch")
+
+# Recently fetched prices: symbol -> (price, expires_at on the monotonic clock)
+_PRICE_CACHE = {}
+
+def _cached_price(sym):
+    hit = _PRICE_CACHE.get(sym)
+    if hit and time.monotonic() < hit[1]:
+        return hit[0]
+    return None
+
+def _cache_price(sym, price, cache_seconds):
+    if cache_seconds > 0:
+        _PRICE_CACHE[sym] = (price, time.monotonic() + cache_seconds)
+
+def fetch_price_multi(sym: str, cache_seconds=0) -> float:
+    """
+    Query Binance, Bitunix, Bybit, Coinbase, Upbit and OKX concurrently (no API keys).
+    Returns the price of the first source in that order that answers, as float, so a
+    faster lower-priority exchange never replaces Binance. Raises RuntimeError if all fail.
+    A price fetched less than cache_seconds ago is returned without network I/O.
+    """
+    if cache_seconds > 0:
+        price = _cached_price(sym)
+        if price is not None:
+            return price
+    price = _fetch_price_any(sym)
+    _cache_price(sym, price, cache_seconds)
+    return price
+
+# Best source that answered for a symbol: symbol -> (source name, found_at). It is tried
+# alone first; after LAST_SOURCE_TTL_SECONDS all sources are queried again to re-probe.
+_LAST_SOURCE = {}
+LAST_SOURCE_TTL_SECONDS = 600
+
+# Longest a fan-out waits for the exchanges before giving up on the slow ones
+# (covers a 10 s read plus the retries in _http_json).
+FETCH_DEADLINE_SECONDS = 20
+
+def _fetch_price_any(sym):
     errors = []
-
-    # 1) Binance
+    sources = PRICE_SOURCES
+    last = _LAST_SOURCE.get(sym)
+    if last and time.monotonic() - last[1] < LAST_SOURCE_TTL_SECONDS:
+        name = last[0]
+        try:
+            return _call_exchange(name, dict(PRICE_SOURCES)[name], sym)
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+            log_message(f"{name} error {sym}: {e}")
+            _LAST_SOURCE.pop(sym, None)
+        sources = [(n, f) for n, f in PRICE_SOURCES if n != name]
+
+    # all sources run at once, but the results are taken in PRICE_SOURCES order: the first
+    # success is also the best one, as every source ahead of it has failed
+    futures = [(name, _FETCH_POOL.submit(_call_exchange, name, fetch, sym)) for name, fetch in sources]
+    deadline = time.monotonic() + FETCH_DEADLINE_SECONDS
     try:
-        pair = _sym_binance(sym)
-        data = _http_json(f"https://data-api.binance.vision/api/v3/ticker/price?symbol={pair}")
-        return float(data["price"])
-    except Exception as e:
-        errors.append(f"Binance: {e}")
-        log_message(f"Binance error {sym}: {e}")
+        for name, fut in futures:
+            try:
+                price = fut.result(timeout=max(0, deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                errors.append(f"{name}: timed out")
+                continue
+            except CancelledError:
+                errors.append(f"{name}: cancelled")
+                continue
+            except Exception as e:
+                errors.append(f"{name}: {e}")
+                log_message(f"{name} error {sym}: {e}")
+                continue
+            _LAST_SOURCE[sym] = (name, time.monotonic())
+            return price
+    finally:
+        # drop the lower-priority sources that have not started yet
+        for _, fut in futures:
+            fut.cancel()
 
-    # 2) Bitunix (futures markPrice as fallback)
-    try:
-        pair = _sym_bitunix(sym)
-        data = _http_json(f"https://fapi.bitunix.com/api/v1/futures/market/tickers?symbols={pair}")
-        items = data.get("data") or []
-        if items:
-            return float(items[0]["markPrice"])
-        raise RuntimeError("empty list")
-    except Exception as e:
-        errors.append(f"Bitunix: {e}")
-        log_message(f"Bitunix error {sym}: {e}")
+    raise RuntimeError("All price sources failed: " + " | ".join(errors))
 
-    # 3) Bybit
-    try:
-        pair = _sym_bybit(sym)
-        data = _http_json(f"https://api.bybit.com/v5/market/tickers?category=spot&symbol={pair}")
-        items = data.get("result", {}).get("list", [])
-        if items:
-            return float(items[0]["lastPrice"])
-        raise RuntimeError("empty list")
-    except Exception as e:
-        errors.append(f"Bybit: {e}")
-        log_message(f"Bybit error {sym}: {e}")
+def fetch_all_prices_binance() -> dict:
+    data = _http_json("https://data-api.binance.vision/api/v3/ticker/price")
+    return {d["symbol"]: float(d["price"]) for d in data}
 
-    # 4) Coinbase
-    try:
-        pair = _sym_coinbase(sym)
-        data = _http_json(f"https://api.exchange.coinbase.com/products/{pair}/ticker")
-        return float(data["price"])
-    except Exception as e:
-        errors.append(f"Coinbase: {e}")
-        log_message(f"Coinbase error {sym}: {e}")
+def fetch_all_prices_bybit() -> dict:
+    data = _http_json("https://api.bybit.com/v5/market/tickers?category=spot")
+    return {d["symbol"]: float(d["lastPrice"]) for d in data.get("result", {}).get("list", [])}
 
-    # 5) Upbit
-    try:
-        pair = _sym_upbit(sym)
-        arr = _http_json(f"https://api.upbit.com/v1/ticker?markets={pair}")
-        if isinstance(arr, list) and arr:
-            return float(arr[0]["trade_price"])
-        raise RuntimeError("empty list")
-    except Exception as e:
-        errors.append(f"Upbit: {e}")
-        log_message(f"Upbit error {sym}: {e}")
+BULK_PRICE_SOURCES = (
+    ("Binance", fetch_all_prices_binance),
+    ("Bybit", fetch_all_prices_bybit),
+)
+
+# Last full ticker table per bulk exchange: name -> (table, fetched_at on the monotonic clock)
+_BULK_TABLES = {}
 
-    # 6) OKX
+def _bulk_table(name, fetch_all, cache_seconds):
+    hit = _BULK_TABLES.get(name)
+    if hit and cache_seconds > 0 and time.monotonic() - hit[1] < cache_seconds:
+        return hit[0]
+    table = _call_exchange(name, fetch_all)
+    _BULK_TABLES[name] = (table, time.monotonic())
+    return table
+
+def fetch_all_prices(symbols, cache_seconds=0) -> dict:
+    """
+    One ticker request per exchange for all symbols (Binance, then Bybit for the rest).
+    Returns {symbol: price} for the symbols found; missing ones are left out.
+    A table fetched less than cache_seconds ago is reused, so it serves any symbol.
+    """
+    prices = {}
+    for name, fetch_all in BULK_PRICE_SOURCES:
+        missing = [s for s in symbols if s not in prices]
+        if not missing:
+            break
+        try:
+            table = _bulk_table(name, fetch_all, cache_seconds)
+        except Exception as e:
+            log_message(f"{name} bulk error: {e}")
+            continue
+        for s in missing:
+            price = table.get(_sym_binance(s))
+            if price is not None:
+                prices[s] = price
+    return prices
+
+def target_of(coin):
+    """The coin's target price as float, or None if the stored value is unusable (null, NaN)."""
     try:
-        pair = _sym_okx(sym)
-        data = _http_json(f"https://www.okx.com/api/v5/market/ticker?instId={pair}")
-        arr = data.get("data", [])
-        if arr:
-            return float(arr[0]["last"])
-        raise RuntimeError("empty data")
-    except Exception as e:
-        errors.append(f"OKX: {e}")
-        log_message(f"OKX error {sym}: {e}")
+        target = float(coin["target_price"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return target if math.isfinite(target) else None
 
-    raise RuntimeError("All price sources failed: " + " | ".join(errors))
+def find_hits(coins, prices):
+    """
+    Evaluate every coin's alert condition against a {symbol: price} map in one pass.
+    Returns ALARM payloads for the coins that hit; coins without a price or a usable
+    target are skipped.
+    """
+    hits = []
+    for coin in coins:
+        price = prices.get(coin["symbol"])
+        if price is None:
+            continue
+        target = target_of(coin)
+        if target is None:
+            log_message(f"Skipping {coin['symbol']}: invalid target price {coin.get('target_price')!r}")
+            continue
+        if (price >= target) if coin.get("condition", ">=") == ">=" else (price <= target):
+            hits.append({"id": coin["id"], "symbol": coin["symbol"], "target": target, "price": price})
+    return hits
+
+# Coins within HOT_PROXIMITY of their target are re-checked every HOT_POLL_SECONDS
+# between regular cycles, with per-symbol requests instead of the bulk tables.
+HOT_PROXIMITY = 0.02
+HOT_POLL_SECONDS = 5
+
+def near_target(coins, prices):
+    hot = []
+    for coin in coins:
+        price = prices.get(coin["symbol"])
+        target = target_of(coin)
+        if price is not None and target is not None and target > 0 and abs(price - target) / target < HOT_PROXIMITY:
+            hot.append(coin)
+    return hot
 
 # --------------------------- Alarm Window ---------------------------
 
+BEEP_INTERVAL_MS = 1000
+
 class AlarmWindow(tk.Toplevel):
-    def __init__(self, master, symbol, target_price, current_price, auto_silence_seconds=60):
+    """
+    Single alarm window shared by all triggered alerts.
+    Each add_trigger() appends a line and restarts the sound / auto-silence timer.
+    """
+    def __init__(self, master, auto_silence_seconds=60):
         super().__init__(master)
-        self.title(f"ALERT: {symbol}")
-        self.geometry("420x220")
+        self.title("ALERT")
+        self.geometry("460x300")
         self.resizable(False, False)
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
-        self.symbol = symbol
-        self.target_price = target_price
-        self.current_price = current_price
         self.auto_silence_seconds = max(1, int(auto_silence_seconds))
-        self._sound_thread = None
-        self._sound_stop = threading.Event()
+        self._silence_job = None
+        self._beep_job = None  # repeating MessageBeep when the alias sound can't play
 
-        header = ttk.Label(self, text=f"Price Alert Triggered: {symbol}", font=("Segoe UI", 14, "bold"))
-        header.pack(pady=(14,8))
+        self.header = ttk.Label(self, text="Price Alert Triggered", font=("Segoe UI", 14, "bold"))
+        self.header.pack(pady=(14,8))
+
+        self.triggers = tk.Listbox(self, height=6, activestyle="none")
+        self.triggers.pack(fill="both", expand=True, padx=12)
 
         info = ttk.Label(self, anchor="center", justify="center",
-                         text=(f"Target price: {target_price}\n"
-                               f"Current price: {current_price}\n\n"
-                               f"Sound will auto-silence after {self.auto_silence_seconds} seconds.\n"
+                         text=(f"Sound will auto-silence after {self.auto_silence_seconds} seconds.\n"
                                f"This window stays open until you close it."))
-        info.pack(padx=12)
+        info.pack(padx=12, pady=(8,0))
 
         btns = ttk.Frame(self)
-        btns.pack(pady=16)
+        btns.pack(pady=12)
 
         self.silence_btn = ttk.Button(btns, text="Silence Sound", command=self.silence_sound)
         self.silence_btn.grid(row=0, column=0, padx=6)
@@ -217,33 +603,48 @@ class AlarmWindow(tk.Toplevel):
         close_btn = ttk.Button(btns, text="Close Window", command=self.on_close)
         close_btn.grid(row=0, column=1, padx=6)
 
+    def add_trigger(self, symbol, target_price, current_price):
+        ts = time.strftime("%H:%M:%S")
+        self.triggers.insert("end", f"{ts}  {symbol}  target {target_price}  current {current_price}")
+        self.triggers.see("end")
+        count = self.triggers.size()
+        self.title(f"ALERT: {symbol}" if count == 1 else f"ALERT: {count} alerts")
+        self.header.configure(text=f"Price Alert Triggered: {symbol}")
+        self.deiconify()
+        self.lift()
         self.after(100, self.start_sound_loop)
 
     def start_sound_loop(self):
-        if self._sound_thread is not None:
-            return
-        self._sound_stop.clear()
-        self._sound_thread = threading.Thread(target=self._beep_worker, daemon=True)
-        self._sound_thread.start()
-
-    def _beep_worker(self):
-        start = time.time()
-        while not self._sound_stop.is_set():
+        # the OS loops the sound asynchronously; we only schedule when to stop it
+        if self._silence_job is not None:
+            self.after_cancel(self._silence_job)  # already playing: just extend it
+        else:
             try:
-                winsound.Beep(1500, 400)
+                winsound.PlaySound("SystemExclamation",
+                                   winsound.SND_ALIAS | winsound.SND_ASYNC | winsound.SND_LOOP)
             except Exception:
-                winsound.MessageBeep()
-                time.sleep(0.4)
-            for _ in range(4):
-                if self._sound_stop.is_set():
-                    break
-                time.sleep(0.1)
-            if time.time() - start >= self.auto_silence_seconds:
-                self._sound_stop.set()
-                break
+                self._beep()
+        self._silence_job = self.after(self.auto_silence_seconds * 1000, self.silence_sound)
+
+    def _beep(self):
+        # fallback: keep beeping until silenced, like the looping sound would
+        try:
+            winsound.MessageBeep()
+        except Exception:
+            pass
+        self._beep_job = self.after(BEEP_INTERVAL_MS, self._beep)
 
     def silence_sound(self):
-        self._sound_stop.set()
+        if self._silence_job is not None:
+            self.after_cancel(self._silence_job)
+            self._silence_job = None
+            if self._beep_job is not None:
+                self.after_cancel(self._beep_job)
+                self._beep_job = None
+            try:
+                winsound.PlaySound(None, 0)
+            except Exception:
+                pass
 
     def on_close(self):
         self.silence_sound()
@@ -251,35 +652,105 @@ class AlarmWindow(tk.Toplevel):
 
 # --------------------------- Edit Dialog ---------------------------
 
-class EditCoinDialog(simpledialog.Dialog):
-    def __init__(self, parent, title, coin=None, assume_quote="USDT"):
-        self.coin = coin or {}
+class EditCoinDialog(tk.Toplevel):
+    """
+    Modal edit dialog built once and kept withdrawn between uses.
+    ask(coin) fills the fields, shows it and returns the validated result (None on cancel).
+    """
+    def __init__(self, parent, title, assume_quote="USDT"):
+        super().__init__(parent)
+        self.withdraw()
+        self.title(title)
+        self.transient(parent)
+        self.resizable(False, False)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.bind("<Destroy>", self._on_destroy)
+
+        self.parent = parent
         self.assume_quote = assume_quote
-        super().__init__(parent, title)
+        self.result = None
+        self._done = tk.BooleanVar(value=False)
+
+        frame = ttk.Frame(self)
+        frame.pack(padx=5, pady=5)
+        self.initial_focus = self.body(frame)
+        self.buttonbox()
 
     def body(self, master):
         ttk.Label(master, text="Symbol (e.g., BTCUSDT or BTC):").grid(row=0, column=0, sticky="w", padx=6, pady=(8,2))
-        self.symbol_var = tk.StringVar(value=self.coin.get("symbol", ""))
+        self.symbol_var = tk.StringVar()
         self.symbol_entry = ttk.Entry(master, textvariable=self.symbol_var, width=28)
         self.symbol_entry.grid(row=1, column=0, sticky="we", padx=6)
 
         ttk.Label(master, text="Target Price:").grid(row=2, column=0, sticky="w", padx=6, pady=(8,2))
-        self.price_var = tk.StringVar(value=str(self.coin.get("target_price", "")))
+        self.price_var = tk.StringVar()
         self.price_entry = ttk.Entry(master, textvariable=self.price_var, width=28)
         self.price_entry.grid(row=3, column=0, sticky="we", padx=6)
 
         ttk.Label(master, text="Condition:").grid(row=4, column=0, sticky="w", padx=6, pady=(8,2))
-        self.cond_var = tk.StringVar(value=self.coin.get("condition", ">="))
+        self.cond_var = tk.StringVar(value=">=")
         self.cond_combo = ttk.Combobox(master, textvariable=self.cond_var, values=[">=", "<="], state="readonly", width=6)
         self.cond_combo.grid(row=5, column=0, sticky="w", padx=6)
 
         ttk.Label(master, text="Status:").grid(row=6, column=0, sticky="w", padx=6, pady=(8,2))
-        self.enabled_var = tk.BooleanVar(value=bool(self.coin.get("enabled", True)))
+        self.enabled_var = tk.BooleanVar(value=True)
         self.enabled_chk = ttk.Checkbutton(master, text="Enabled", variable=self.enabled_var)
         self.enabled_chk.grid(row=7, column=0, sticky="w", padx=6)
 
         return self.symbol_entry
 
+    def buttonbox(self):
+        box = ttk.Frame(self)
+        box.pack(pady=(0,8))
+        ttk.Button(box, text="OK", width=10, command=self.ok, default="active").pack(side="left", padx=5)
+        ttk.Button(box, text="Cancel", width=10, command=self.cancel).pack(side="left", padx=5)
+        self.bind("<Return>", self.ok)
+        self.bind("<Escape>", self.cancel)
+
+    def populate(self, coin):
+        self.symbol_var.set(coin.get("symbol", ""))
+        self.price_var.set(str(coin.get("target_price", "")))
+        self.cond_var.set(coin.get("condition", ">="))
+        self.enabled_var.set(bool(coin.get("enabled", True)))
+
+    def ask(self, coin, assume_quote=None):
+        if assume_quote:
+            self.assume_quote = assume_quote
+        self.populate(coin)
+        self.result = None
+        self.geometry(f"+{self.parent.winfo_rootx() + 50}+{self.parent.winfo_rooty() + 50}")
+        self.deiconify()
+        try:
+            self.wait_visibility()  # grab_set fails on a window that isn't mapped yet
+            self.grab_set()
+            self.initial_focus.focus_set()
+            self.wait_variable(self._done)
+        except tk.TclError:
+            return None
+        finally:
+            try:
+                self.grab_release()
+                self.withdraw()
+                self.parent.focus_set()
+            except tk.TclError:  # destroyed along with the app while open
+                pass
+        return self.result
+
+    def _on_destroy(self, event):
+        # the app is closing while the dialog is open: end the wait in ask()
+        if event.widget is self:
+            self._done.set(True)
+
+    def ok(self, event=None):
+        if not self.validate():
+            self.initial_focus.focus_set()
+            return
+        self._done.set(True)
+
+    def cancel(self, event=None):
+        self.result = None
+        self._done.set(True)
+
     def validate(self):
         sym = normalize_symbol(self.symbol_var.get(), self.assume_quote)
         if not sym:
@@ -287,7 +758,7 @@ class EditCoinDialog(simpledialog.Dialog):
             return False
         try:
             price = float(self.price_var.get())
-            if price <= 0:
+            if not math.isfinite(price) or price <= 0:  # "nan"/"inf" parse but can't be saved
                 raise ValueError
         except Exception:
             messagebox.showwarning("Invalid Price", "Please enter a valid target price (> 0).")
@@ -304,66 +775,132 @@ class EditCoinDialog(simpledialog.Dialog):
 class PriceChecker(threading.Thread):
     """
     Worker thread that checks prices of enabled alerts without blocking UI.
-    Sends UI tasks via queue to the main thread.
+    Sends UI tasks via queue to the main thread and wakes it with <<PriceEvent>>.
     """
     def __init__(self, app, task_queue):
         super().__init__(daemon=True)
         self.app = app
         self.q = task_queue
         self._stop = threading.Event()
+        self._pool = DaemonThreadPool(max_workers=8, thread_name_prefix="coin-check")
+        self._pending = {}  # symbol -> fetch future not yet finished
+        self._check_now = threading.Event()
+        self._stopped = Future()  # completed by stop() to wake a check waiting on fetches
 
     def stop(self):
         self._stop.set()
+        self._check_now.set()  # wake the interval wait
+        if not self._stopped.done():
+            self._stopped.set_result(None)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def request_check(self):
+        """Run a check right away instead of waiting for the interval (Refresh Now)."""
+        self._check_now.set()
+
+    def cancel_symbol(self, sym):
+        """Drop a not-yet-started fetch for sym (its alerts were disabled or deleted)."""
+        fut = self._pending.get(sym)
+        if fut is not None:
+            fut.cancel()
+
+    def check_prices(self, coins, cache_seconds, timeout, use_bulk=True):
+        """
+        Fetch prices for coins (bulk tickers first, the rest in parallel) and evaluate them.
+        Returns (ALARM payloads, error count, {symbol: price}). Safe to call from any thread.
+        """
+        bulk = fetch_all_prices({c["symbol"] for c in coins}, cache_seconds) if coins and use_bulk else {}
+
+        # symbols the bulk exchanges don't list are fetched individually, in parallel
+        prices = dict(bulk)
+        by_symbol = {}
+        for coin in coins:
+            if coin["symbol"] not in prices:
+                by_symbol.setdefault(coin["symbol"], []).append(coin)
+        try:
+            futures = {self._pool.submit(fetch_price_multi, sym, cache_seconds): sym for sym in by_symbol}
+        except RuntimeError:  # pool already shut down by stop()
+            return [], 0, prices
+        for fut, sym in futures.items():
+            self._pending[sym] = fut
 
-    def run(self):
-        while not self._stop.is_set():
-            try:
-                interval = int(self.app.settings.get("check_interval_seconds", 60))
-            except Exception:
-                interval = 60
-
-            coins_snapshot = list(self.app.coins)  # shallow copy
-            now_str = time.strftime("%Y-%m-%d %H:%M:%S")
-            errors = 0
-
-            for coin in coins_snapshot:
+        errors = 0
+        try:
+            for fut in as_completed([*futures, self._stopped], timeout=timeout):
                 if self._stop.is_set():
+                    for pending in futures:
+                        pending.cancel()
                     break
-                if not coin.get("enabled", True):
+                sym = futures[fut]
+                if fut.cancelled():
                     continue
-                sym = coin["symbol"]
                 try:
-                    price = fetch_price_multi(sym)
+                    prices[sym] = fut.result()
                 except Exception as e:
-                    errors += 1
+                    errors += len(by_symbol[sym])
                     log_message(f"Fetch error for {sym}: {e}")
-                    continue
+        except FuturesTimeoutError:
+            for fut, sym in futures.items():
+                if not fut.done():
+                    fut.cancel()
+                    errors += len(by_symbol[sym])
+                    log_message(f"Fetch error for {sym}: timed out")
+        finally:
+            for fut, sym in futures.items():
+                if self._pending.get(sym) is fut:
+                    del self._pending[sym]
+
+        # skip coins the UI disabled meanwhile (alarm from another check, user action)
+        coins = [c for c in coins if c.get("enabled", True)]
+        return find_hits(coins, prices), errors, prices
+
+    def _post(self, kind, payload):
+        self.q.put((kind, payload))
+        self.app.notify_tasks()
 
-                cond = coin.get("condition", ">=")
-                target = float(coin["target_price"])
-                hit = (price >= target) if cond == ">=" else (price <= target)
+    def run(self):
+        while not self._stop.is_set():
+            manual = self._check_now.is_set()
+            self._check_now.clear()
+            interval = self.app.settings_obj.check_interval_seconds
+            cache_seconds = self.app.settings_obj.price_cache_seconds
 
-                if hit:
-                    # enqueue a UI task: show alarm and disable the alert (do not delete)
-                    self.q.put(("ALARM", {"id": coin["id"], "symbol": sym, "target": target, "price": price}))
+            coins_snapshot = list(self.app.coins)  # shallow copy
+            now_str = time.strftime("%Y-%m-%d %H:%M:%S")
 
-                # small polite delay
-                for _ in range(5):
-                    if self._stop.is_set():
-                        break
-                    time.sleep(0.01)
+            enabled = [c for c in coins_snapshot if c.get("enabled", True)]
+            hits, errors, prices = self.check_prices(enabled, cache_seconds, timeout=max(5, interval - 5))
+            for hit in hits:
+                # enqueue a UI task: show alarm and disable the alert (do not delete)
+                self._post("ALARM", hit)
 
             # update status line via queue
+            label = "Manual check" if manual else "Last check"
             if errors:
-                self.q.put(("STATUS", f"Last check {now_str} — {errors} error(s)."))
+                self._post("STATUS", f"{label} {now_str} — {errors} error(s).")
             else:
-                self.q.put(("STATUS", f"Last check {now_str} — OK."))
+                self._post("STATUS", f"{label} {now_str} — OK.")
 
-            # sleep until next cycle
-            for _ in range(interval * 10):  # 0.1s ticks
-                if self._stop.is_set():
+            # sleep until next cycle (or until Refresh Now / stop), re-checking
+            # coins close to their target every HOT_POLL_SECONDS meanwhile
+            hot = near_target([c for c in enabled if c.get("enabled", True)], prices)
+            deadline = time.monotonic() + interval
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
                     break
-                time.sleep(0.1)
+                if not hot:
+                    self._check_now.wait(remaining)
+                    break
+                if self._check_now.wait(min(HOT_POLL_SECONDS, remaining)):
+                    break
+                hot = [c for c in hot if c.get("enabled", True)]
+                hits, _, hot_prices = self.check_prices(hot, 0, timeout=HOT_POLL_SECONDS, use_bulk=False)
+                for hit in hits:
+                    self._post("ALARM", hit)
+                # coins whose fetch failed stay hot; those that drifted away drop out
+                prices.update(hot_prices)
+                hot = near_target(hot, prices)
 
 # --------------------------- Main App ---------------------------
 
@@ -376,19 +913,33 @@ class CryptoAlertApp(tk.Tk):
 
         self.db = load_db()
         self.coins = self.db["coins"]
+        self._by_id = {c["id"]: c for c in self.coins}
+        self._view = list(self.coins)  # display order (sorted view of self.coins)
         self.settings = self.db["settings"]
+        self.settings_obj = Settings.from_dict(self.settings)
 
         self._sort_state = {"column": None, "reverse": False}
         self._filter_text = ""
+        self._sym_upper = {c["id"]: c.get("symbol", "").upper() for c in self.coins}
+        self._filtered_ids = None  # ids matching _filter_text; None = no filter
+        self._row_state = {}  # coin id -> values currently shown in the tree
+        self._alarm_window = None
+
+        # debounced DB writes (see _mark_dirty / _flush_db)
+        self._db_dirty = False
+        self._db_flush_id = None
+        self._db_hash = hash(dump_db(self.db))
 
         # UI
         self._build_ui()
+        self._edit_dialog = EditCoinDialog(self, "Edit Alert", assume_quote=self.settings_obj.assume_quote)
 
         # Worker thread & queue
         self.task_queue = queue.Queue()
+        self.bind("<<PriceEvent>>", self._process_queue)
         self.worker = PriceChecker(self, self.task_queue)
         self.worker.start()
-        self.after(100, self._process_queue)
+        self.after(100, self._process_queue)  # anything queued before mainloop started
 
     # ---------- UI ----------
 
@@ -435,11 +986,11 @@ class CryptoAlertApp(tk.Tk):
         settings_frame.pack(fill="x", pady=(0,10))
 
         ttk.Label(settings_frame, text="Check interval (sec):").grid(row=0, column=0, padx=6, pady=6, sticky="w")
-        self.interval_var = tk.StringVar(value=str(self.settings.get("check_interval_seconds", 60)))
+        self.interval_var = tk.StringVar(value=str(self.settings_obj.check_interval_seconds))
         ttk.Entry(settings_frame, textvariable=self.interval_var, width=8).grid(row=0, column=1, padx=6, pady=6, sticky="w")
 
         ttk.Label(settings_frame, text="Auto-silence sound after (sec):").grid(row=0, column=2, padx=6, pady=6, sticky="w")
-        self.silence_var = tk.StringVar(value=str(self.settings.get("auto_silence_seconds", 60)))
+        self.silence_var = tk.StringVar(value=str(self.settings_obj.auto_silence_seconds))
         ttk.Entry(settings_frame, textvariable=self.silence_var, width=8).grid(row=0, column=3, padx=6, pady=6, sticky="w")
 
         ttk.Button(settings_frame, text="Save Settings", command=self.save_settings).grid(row=0, column=4, padx=10, pady=6)
@@ -478,39 +1029,86 @@ class CryptoAlertApp(tk.Tk):
 
         self.refresh_tree()
 
+    # ---------- Persistence ----------
+
+    def _mark_dirty(self):
+        self._db_dirty = True
+        if self._db_flush_id is None:
+            self._db_flush_id = self.after(500, self._flush_db)
+
+    def _flush_db(self):
+        self._db_flush_id = None
+        if not self._db_dirty:
+            return
+        self._db_dirty = False
+        text = dump_db(self.db)
+        text_hash = hash(text)
+        if text_hash == self._db_hash:
+            return  # nothing actually changed on disk
+        if save_db(self.db, text):
+            self._db_hash = text_hash
+
     # ---------- Queue from worker ----------
 
-    def _process_queue(self):
+    def notify_tasks(self):
+        """Wake the Tk thread to drain task_queue; safe to call from worker threads."""
+        try:
+            self.event_generate("<<PriceEvent>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            pass  # window closing or mainloop not running yet
+
+    def _process_queue(self, _event=None):
+        # drain everything first, then save/refresh once for the whole batch
+        alarms = []
+        changed = []
         try:
             while True:
                 kind, payload = self.task_queue.get_nowait()
                 if kind == "ALARM":
-                    coin_id = payload["id"]
-                    sym = payload["symbol"]
-                    target = payload["target"]
-                    price = payload["price"]
                     # find coin, set enabled -> False (do not remove)
-                    coin = next((c for c in self.coins if c["id"] == coin_id), None)
-                    if coin:
-                        coin["enabled"] = False
-                        save_db(self.db)
-                        self.refresh_tree()
-                    # show alarm window
-                    AlarmWindow(self, symbol=sym, target_price=target, current_price=price,
-                                auto_silence_seconds=int(self.settings.get("auto_silence_seconds", 60)))
-                    log_message(f"ALERT triggered for {sym} | target {target} | current {price} | disabled alert")
+                    coin = self._by_id.get(payload["id"])
+                    if not coin or not coin.get("enabled", True):
+                        continue  # deleted, or already alarmed by another check
+                    self._disable_coin(coin)
+                    changed.append(coin)
+                    alarms.append(payload)
 
                 elif kind == "STATUS":
                     self.status_var.set(payload)
         except queue.Empty:
             pass
-        # schedule next poll
-        self.after(120, self._process_queue)
+
+        if changed:
+            self._mark_dirty()
+            for coin in changed:
+                self._tree_update(coin)
+        for alarm in alarms:
+            sym, target, price = alarm["symbol"], alarm["target"], alarm["price"]
+            # show alarm (one shared window for all triggers)
+            if self._alarm_window is None or not self._alarm_window.winfo_exists():
+                self._alarm_window = AlarmWindow(
+                    self, auto_silence_seconds=self.settings_obj.auto_silence_seconds)
+            self._alarm_window.add_trigger(sym, target, price)
+            log_message(f"ALERT triggered for {sym} | target {target} | current {price} | disabled alert")
+
+    def _disable_coin(self, coin):
+        coin["enabled"] = False
+        # nothing else waits on this symbol: let the worker skip its pending fetch
+        sym = coin["symbol"]
+        if not any(c["symbol"] == sym and c.get("enabled", True) for c in self.coins):
+            self.worker.cancel_symbol(sym)
 
     # ---------- Search & Sort ----------
 
     def _on_search_changed(self):
-        self._filter_text = (self.search_var.get() or "").strip().upper()
+        text = (self.search_var.get() or "").strip().upper()
+        if text == self._filter_text:
+            return
+        self._filter_text = text
+        if text:
+            self._filtered_ids = {cid for cid, up in self._sym_upper.items() if text in up}
+        else:
+            self._filtered_ids = None
         self.refresh_tree()
 
     def _sort_by(self, key):
@@ -518,55 +1116,131 @@ class CryptoAlertApp(tk.Tk):
         if self._sort_state["column"] == key:
             reverse = not self._sort_state["reverse"]
         self._sort_state = {"column": key, "reverse": reverse}
-
-        def sort_key(c):
-            if key == "target_price":
-                return float(c.get("target_price", 0))
-            if key == "enabled":
-                return 1 if c.get("enabled", True) else 0
-            return str(c.get(key, "")).upper()
-
-        self.coins.sort(key=sort_key, reverse=reverse)
-        save_db(self.db)
+        self._sort_view()
         self.refresh_tree()
 
+    def _sort_key(self, c):
+        key = self._sort_state["column"]
+        if key == "target_price":
+            return target_of(c) or 0.0
+        if key == "enabled":
+            return 1 if c.get("enabled", True) else 0
+        return str(c.get(key, "")).upper()
+
+    def _sort_view(self):
+        # sorts the displayed view only; the stored order stays as added
+        if self._sort_state["column"] is None:
+            return
+        self._view.sort(key=self._sort_key, reverse=self._sort_state["reverse"])
+
+    def _view_insert(self, coin):
+        # place a new coin by the current sort without re-sorting the others: rows whose
+        # keys changed since the last header click keep their place, as they do in the tree
+        if self._sort_state["column"] is not None:
+            k = self._sort_key(coin)
+            reverse = self._sort_state["reverse"]
+            for i, c in enumerate(self._view):
+                ck = self._sort_key(c)
+                if (ck < k) if reverse else (ck > k):
+                    self._view.insert(i, coin)
+                    return
+        self._view.append(coin)
+
     # ---------- Tree helpers ----------
 
     def _iter_filtered(self):
-        for c in self.coins:
-            if not self._filter_text:
-                yield c
+        if self._filtered_ids is None:
+            return iter(self._view)
+        return (c for c in self._view if c["id"] in self._filtered_ids)
+
+    def _index_symbol(self, coin):
+        # keep the search index in step after a coin is added or its symbol edited
+        up = coin.get("symbol", "").upper()
+        self._sym_upper[coin["id"]] = up
+        if self._filtered_ids is not None:
+            if self._filter_text in up:
+                self._filtered_ids.add(coin["id"])
             else:
-                if self._filter_text in c.get("symbol","").upper():
-                    yield c
+                self._filtered_ids.discard(coin["id"])
 
     def refresh_tree(self):
-        self.tree.delete(*self.tree.get_children())
-        for coin in self._iter_filtered():
-            iid = coin["id"]
-            status = "Enabled" if coin.get("enabled", True) else "Disabled"
-            self.tree.insert("", "end", iid=iid,
-                             values=(coin["symbol"], coin["target_price"], coin["condition"], status))
+        # apply only the delta against what the tree already shows
+        wanted = [(coin["id"], self._row_values(coin)) for coin in self._iter_filtered()]
+        wanted_ids = [iid for iid, _ in wanted]
+
+        visible = set(wanted_ids)
+        for iid in [i for i in self._row_state if i not in visible]:
+            self.tree.delete(iid)
+            del self._row_state[iid]
+
+        for iid, values in wanted:
+            old = self._row_state.get(iid)
+            if old is None:
+                self.tree.insert("", "end", iid=iid, values=values)
+            elif old != values:
+                self.tree.item(iid, values=values)
+            self._row_state[iid] = values
+
+        if list(self.tree.get_children()) != wanted_ids:
+            for index, iid in enumerate(wanted_ids):
+                self.tree.move(iid, "", index)
+
+    def _row_values(self, coin):
+        status = "Enabled" if coin.get("enabled", True) else "Disabled"
+        return (coin["symbol"], coin["target_price"], coin["condition"], status)
+
+    def _is_visible(self, coin):
+        return self._filtered_ids is None or coin["id"] in self._filtered_ids
+
+    def _tree_add(self, coin):
+        # single-row insert at the coin's place in the (sorted) view
+        if not self._is_visible(coin):
+            return
+        index = 0
+        for c in self._iter_filtered():
+            if c is coin:
+                break
+            index += 1
+        values = self._row_values(coin)
+        self.tree.insert("", index, iid=coin["id"], values=values)
+        self._row_state[coin["id"]] = values
+
+    def _tree_update(self, coin):
+        # single-row update; falls back to refresh_tree if the row's visibility changed
+        iid = coin["id"]
+        if (iid in self._row_state) != self._is_visible(coin):
+            self.refresh_tree()
+            return
+        if iid not in self._row_state:
+            return
+        values = self._row_values(coin)
+        if self._row_state[iid] != values:
+            self.tree.item(iid, values=values)
+            self._row_state[iid] = values
+
+    def _tree_remove(self, iid):
+        if self._row_state.pop(iid, None) is not None:
+            self.tree.delete(iid)
 
     def _selected_coin(self):
         sel = self.tree.selection()
         if not sel:
             return None
         iid = sel[0]
-        return next((c for c in self.coins if c["id"] == iid), None)
+        return self._by_id.get(iid)
 
     # ---------- CRUD & actions ----------
 
     def add_alert(self):
         sym_raw = self.symbol_var.get()
         price_raw = self.price_var.get()
-        sym = normalize_symbol(sym_raw, self.settings.get("assume_quote", "USDT"))
+        sym = normalize_symbol(sym_raw, self.settings_obj.assume_quote)
         if not sym:
             messagebox.showwarning("Invalid Symbol", "Please enter a symbol (e.g., BTC or BTCUSDT).")
             return
         try:
             price = float(price_raw)
-            if price <= 0:
+            if not math.isfinite(price) or price <= 0:  # "nan"/"inf" parse but can't be saved
                 raise ValueError
         except Exception:
             messagebox.showwarning("Invalid Price", "Please enter a valid target price (> 0).")
@@ -584,8 +1258,11 @@ class CryptoAlertApp(tk.Tk):
             "enabled": bool(self.enabled_var.get())
         }
         self.coins.append(coin)
-        save_db(self.db)
-        self.refresh_tree()
+        self._by_id[coin["id"]] = coin
+        self._index_symbol(coin)
+        self._view_insert(coin)
+        self._mark_dirty()
+        self._tree_add(coin)
         self.symbol_var.set("")
         self.price_var.set("")
         self.cond_var.set(">=")
@@ -596,24 +1273,30 @@ class CryptoAlertApp(tk.Tk):
         if not coin:
             messagebox.showinfo("Edit", "Please select an alert to edit.")
             return
-        dlg = EditCoinDialog(self, "Edit Alert", coin, assume_quote=self.settings.get("assume_quote", "USDT"))
-        if dlg.result:
-            coin["symbol"] = dlg.result["symbol"]
-            coin["target_price"] = float(dlg.result["target_price"])
-            coin["condition"] = dlg.result["condition"]
-            coin["enabled"]  = bool(dlg.result["enabled"])
-            save_db(self.db)
-            self.refresh_tree()
+        result = self._edit_dialog.ask(coin, assume_quote=self.settings_obj.assume_quote)
+        if result:
+            coin["symbol"] = result["symbol"]
+            self._index_symbol(coin)
+            coin["target_price"] = float(result["target_price"])
+            coin["condition"] = result["condition"]
+            coin["enabled"]  = bool(result["enabled"])
+            self._mark_dirty()
+            self._tree_update(coin)
 
     def delete_selected(self):
         coin = self._selected_coin()
         if not coin:
             messagebox.showinfo("Delete", "Please select an alert to delete.")
             return
-        self.coins = [c for c in self.coins if c["id"] != coin["id"]]
-        self.db["coins"] = self.coins
-        save_db(self.db)
-        self.refresh_tree()
+        self.coins.remove(coin)
+        self._disable_coin(coin)  # the worker may still hold it in this cycle's snapshot
+        self._by_id.pop(coin["id"], None)
+        self._sym_upper.pop(coin["id"], None)
+        if self._filtered_ids is not None:
+            self._filtered_ids.discard(coin["id"])
+        self._view.remove(coin)
+        self._mark_dirty()
+        self._tree_remove(coin["id"])
 
     def enable_selected(self):
         coin = self._selected_coin()
@@ -621,41 +1304,21 @@ class CryptoAlertApp(tk.Tk):
             messagebox.showinfo("Enable", "Please select an alert first.")
             return
         coin["enabled"] = True
-        save_db(self.db)
-        self.refresh_tree()
+        self._mark_dirty()
+        self._tree_update(coin)
 
     def disable_selected(self):
         coin = self._selected_coin()
         if not coin:
             messagebox.showinfo("Disable", "Please select an alert first.")
             return
-        coin["enabled"] = False
-        save_db(self.db)
-        self.refresh_tree()
+        self._disable_coin(coin)
+        self._mark_dirty()
+        self._tree_update(coin)
 
     def manual_refresh(self):
-        # Force an immediate light check: spawn a one-off worker that checks enabled alerts quickly
-        threading.Thread(target=self._manual_check_once, daemon=True).start()
-
-    def _manual_check_once(self):
-        errors = 0
-        for coin in list(self.coins):
-            if not coin.get("enabled", True):
-                continue
-            try:
-                price = fetch_price_multi(coin["symbol"])
-            except Exception as e:
-                errors += 1
-                log_message(f"Manual fetch error {coin['symbol']}: {e}")
-                continue
-            cond = coin.get("condition", ">=")
-            target = float(coin["target_price"])
-            hit = (price >= target) if cond == ">=" else (price <= target)
-            if hit:
-                self.task_queue.put(("ALARM", {"id": coin["id"], "symbol": coin["symbol"], "target": target, "price": price}))
-        ts = time.strftime("%Y-%m-%d %H:%M:%S")
-        msg = f"Manual check {ts} — {'OK' if errors==0 else str(errors)+' error(s)'}."
-        self.task_queue.put(("STATUS", msg))
+        # Force an immediate check on the worker thread (clicks while one is queued coalesce)
+        self.worker.request_check()
 
     # ---------- Settings ----------
 
@@ -670,9 +1333,10 @@ class CryptoAlertApp(tk.Tk):
         except Exception as e:
             messagebox.showwarning("Invalid Settings", f"Please enter valid numbers.\n{e}")
             return
-        self.settings["check_interval_seconds"] = interval
-        self.settings["auto_silence_seconds"] = silence
-        save_db(self.db)
+        self.settings_obj.check_interval_seconds = interval
+        self.settings_obj.auto_silence_seconds = silence
+        self.settings.update(self.settings_obj.to_dict())
+        self._mark_dirty()
         self.status_var.set("Settings saved.")
 
     # ---------- Close ----------
@@ -683,6 +1347,13 @@ class CryptoAlertApp(tk.Tk):
                 self.worker.stop()
         except Exception:
             pass
+        if self._db_flush_id is not None:
+            self.after_cancel(self._db_flush_id)
+            self._db_flush_id = None
+        self._flush_db()
+        # drop queued exchange requests so exit doesn't wait for them
+        _FETCH_POOL.shutdown(wait=False, cancel_futures=True)
+        close_http_pool()
         super().destroy()
 
 # --------------------------- Run ---------------------------
@@ -706,6 +1377,7 @@ def main():
 
     root.mainloop()
     log_message("App closed")
+    flush_log()
 
 if __name__ == "__main__":
     main()